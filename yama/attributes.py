@@ -4,11 +4,78 @@
 Contains all the class and functions for maya attributes.
 """
 
+import collections
+import re
+import threading
+
 from maya import cmds, mel
 import maya.api.OpenMaya as om
 import maya.OpenMaya as om1
 
-from . import config, nodes, weightlist, checks, mayautils
+from . import config, nodes, components, weightlist, checks, mayautils
+
+# Matches an attribute name with an optional logical index, e.g.: 'weightList[0]' -> ('weightList', '0')
+_INDEX_RE = re.compile(r"^([^\[]+)(?:\[(\d+)\])?$")
+
+# Default kwargs of Attribute.listConnections, and the short flag names they can be given with.
+_LISTCONNECTIONS_DEFAULTS = {"skipConversionNodes": True, "plugs": True}
+_LISTCONNECTIONS_SHORT_FLAGS = {"scn": "skipConversionNodes", "p": "plugs"}
+
+# Selection lists reused by getMPlug and Attribute.MPlug1, one per thread, instead of creating new ones on each call.
+_SELECTION_LISTS = threading.local()
+
+# MDistance, MAngle and MTime reused by the setMPlugValue handlers, one per thread, instead of creating new ones on
+# each call.
+_UNIT_VALUES = threading.local()
+
+# Maximum number of array element Attributes kept by each Attribute in its _elements cache.
+_ELEMENTS_CACHE_SIZE = 64
+
+# UI units used when getting and setting distance, angle and time values with the api, kept up to date by
+# refreshUiUnits.
+_DISTANCE_UI_UNIT = om.MDistance.uiUnit()
+_ANGLE_UI_UNIT = om.MAngle.uiUnit()
+_TIME_UI_UNIT = om.MTime.uiUnit()
+
+
+def _removeCallbacks(name):
+    """
+    Removes the Maya callbacks stored under the given module global name, registered by a previous import of this
+    module, so reloading it does not register them twice.
+    :param name: str, name of a module global list of callback ids
+    """
+    callback_ids = globals().get(name)
+    if callback_ids:
+        om.MMessage.removeCallbacks(callback_ids)
+        del callback_ids[:]
+
+
+def refreshUiUnits(*args):
+    """
+    Updates the cached UI units used by getMPlugValue and setMPlugValue.
+    Called automatically when Maya's linear, angular or time unit changes, and when a scene is created or opened.
+    :param args: unused, to be used as a Maya callback.
+    """
+    global _DISTANCE_UI_UNIT, _ANGLE_UI_UNIT, _TIME_UI_UNIT
+    _DISTANCE_UI_UNIT = om.MDistance.uiUnit()
+    _ANGLE_UI_UNIT = om.MAngle.uiUnit()
+    _TIME_UI_UNIT = om.MTime.uiUnit()
+
+
+_removeCallbacks("_UI_UNITS_CALLBACK_IDS")
+_UI_UNITS_CALLBACK_IDS = [
+    om.MEventMessage.addEventCallback(event, refreshUiUnits)
+    for event in ("linearUnitChanged", "angularUnitChanged", "timeUnitChanged")
+] + [
+    # Scenes store their own units, refreshing once they are loaded
+    om.MSceneMessage.addCallback(message, refreshUiUnits)
+    for message in (om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterOpen)
+]
+
+
+def removeCallbacks():
+    """Removes the Maya callbacks registered by this module, e.g. before unloading it."""
+    _removeCallbacks("_UI_UNITS_CALLBACK_IDS")
 
 
 def getAttribute(node, attr):
@@ -19,17 +86,26 @@ def getAttribute(node, attr):
     :return: Attribute
     """
     if "." in attr:
-        attrs = attr.split(".")
-        for attr in attrs:
-            node = node.attr(attr)
-        return node
+        attribute = node
+        for name in attr.split("."):
+            match = _INDEX_RE.match(name)
+            if match is None:
+                attribute = attribute.attr(name)
+                continue
+            name, index = match.groups()
+            attribute = attribute.attr(name)
+            if index is not None:
+                attribute = attribute[int(index)]
+        return attribute
     else:
-        MPlug = getMPlug(node.name + "." + attr)
-        return Attribute(MPlug, node)
+        return Attribute._fromMPlug(getMPlug(node.name + "." + attr), node)
 
 
 def getMPlug(attr: str) -> om.MPlug:
-    om_list = om.MSelectionList()
+    om_list = getattr(_SELECTION_LISTS, "om_list", None)
+    if om_list is None:
+        om_list = _SELECTION_LISTS.om_list = om.MSelectionList()
+    om_list.clear()
 
     try:
         om_list.add(attr)
@@ -59,44 +135,87 @@ class Attribute(nodes.Yam):
     A class for handling a node attribute and sub-attributes.
     """
 
+    __slots__ = (
+        "node",
+        "MPlug",
+        "_MPlug1",
+        "_attributes",
+        "_elements",
+        "_children",
+        "_children_generated",
+        "_hashCode",
+        "_types",
+        "_unitless_compound",
+    )
+
     def __init__(self, MPlug, node=None):
         """
         :param node (Depend): the node of the attribute attr.
         :param attr (OpenMaya.MPlug):
         """
         super().__init__()
-        if not isinstance(MPlug, om.MPlug):
+        if MPlug.__class__ is not om.MPlug:  # Not using isinstance() for efficiency
             raise TypeError(
                 f"MPlug arg should be of type OpenMaya.MPlug not : {MPlug.__class__.__name__}"
             )
         if MPlug.isNull:
             raise ValueError("Given MPlug is Null and does not contain a valid attribute.")
 
-        if node:
-            if not isinstance(node, nodes.DependNode):
+        if node is not None:
+            if not hasattr(node, "isAYamNode"):
                 raise TypeError(
                     f"Given node arg should be of type DependNode not : {type(node).__name__}"
                 )
-            self.node = node
         else:
-            self.node = nodes.yam(MPlug.node())
+            node = nodes.yam(MPlug.node())
+        self._initAttribute(MPlug, node)
+
+    @classmethod
+    def _fromMPlug(cls, MPlug, node):
+        """
+        Creates an Attribute without checking the given args, for internal use where the MPlug is known to be valid and
+        the node is its DependNode.
+        :param MPlug: OpenMaya.MPlug
+        :param node: DependNode
+        :return: Attribute object
+        """
+        attribute = cls.__new__(cls)
+        attribute._initAttribute(MPlug, node)
+        return attribute
+
+    def _initAttribute(self, MPlug, node):
+        """Sets the instance variables, shared by __init__ and _fromMPlug."""
+        self.node = node
         self.MPlug = MPlug
         self._MPlug1 = None
         self._attributes = {}  # Dict of attribute children names and short names to MPlug
+        # Least recently used array element Attributes, by logical index, bounded to _ELEMENTS_CACHE_SIZE
+        self._elements = collections.OrderedDict()
         self._children = []  # List of all children Attributes
         self._children_generated = False
         self._hashCode = None
         self._types = None
+        self._unitless_compound = None
 
     def __repr__(self):
         return f"{self.__class__.__name__}('{self.node}.{self.attribute}')"
 
+    @property
+    def isAYamAttribute(self):
+        """Used to check if an object is an instance of Attribute with the faster hasattr instead of slower
+        isinstance."""
+        return True
+
     def __getattr__(self, attr):
         """
         Gets sub attributes of self.
+        Dunder names are never maya attributes and raise an AttributeError right away, so that probes from copy,
+        pickle, inspect, etc. don't query maya.
         :param attr (str): the sub-attribute name.
         :return: Attribute object.
         """
+        if attr.startswith("__") and attr.endswith("__"):
+            raise AttributeError(attr)
         return self.attr(attr)
 
     def __getitem__(self, item):
@@ -104,22 +223,27 @@ class Attribute(nodes.Yam):
         Gets the element of the array attribute at the given index.
         Returns a list of attribute if given a slice.
         """
-        if item == "*":
-            item = slice(None)
-        if item.__class__ == slice:  # Not using isinstance() for efficiency
-            return nodes.YamList(self[i] for i in range(len(self))[item])
+        # Skipping the slice checks for the most common int index; not using isinstance() for efficiency
+        if item.__class__ is not int:
+            if item == "*":
+                item = slice(None)
+            if item.__class__ is slice:
+                return nodes.YamList(self[i] for i in range(len(self))[item])
 
+        elements = self._elements
+        if config.use_singleton:
+            attribute = elements.get(item)
+            if attribute is not None and not attribute.MPlug.isNull:
+                elements.move_to_end(item)
+                return attribute
         try:
-            if (
-                not config.use_singleton
-                or item not in self._attributes
-                or self._attributes[item].MPlug.isNull
-            ):
-                MPlug = self.MPlug.elementByLogicalIndex(item)
-                self._attributes[item] = Attribute(MPlug, self.node)
-            return self._attributes[item]
+            MPlug = self.MPlug.elementByLogicalIndex(item)
         except (RuntimeError, TypeError):
             raise TypeError(f"'{self}' is not an array attribute and cannot use __getitem__")
+        attribute = elements[item] = Attribute._fromMPlug(MPlug, self.node)
+        if len(elements) > _ELEMENTS_CACHE_SIZE:
+            elements.popitem(last=False)
+        return attribute
 
     def __add__(self, other):
         """
@@ -137,10 +261,10 @@ class Attribute(nodes.Yam):
 
     def __contains__(self, item):
         """
-        Using self.attribute for 'in' operator.
-        :return: str
+        Using self.attribute for 'in' operator, checks if item is a substring of the attribute name.
+        :return: bool
         """
-        return item in self.attribute
+        return item in self.alias
 
     def __rshift__(self, other):
         """
@@ -169,15 +293,18 @@ class Attribute(nodes.Yam):
     def __iter__(self):
         if self.isArray():
             node = self.node
+            elementByLogicalIndex = self.MPlug.elementByLogicalIndex
             for i in self.indices():
-                MPlug = self.MPlug.elementByLogicalIndex(i)
-                yield Attribute(MPlug, node)
+                yield Attribute._fromMPlug(elementByLogicalIndex(i), node)
         else:
             raise TypeError(f"'{self}' is not iterable")
 
     def __eq__(self, other):
-        if hasattr(other, "MPlug"):
-            return self.MPlug == other.MPlug
+        if self is other:
+            return True
+        if hasattr(other, "isAYamAttribute"):
+            # Plugs of different attributes cannot be equal, comparing the cached int hashCode first is cheaper.
+            return self.hashCode == other.hashCode and self.MPlug == other.MPlug
         else:
             try:
                 return self.MPlug == nodes.yam(other).MPlug
@@ -194,7 +321,10 @@ class Attribute(nodes.Yam):
         :return: api 1.0 MPlug
         """
         if self._MPlug1 is None:
-            om_list = om1.MSelectionList()
+            om_list = getattr(_SELECTION_LISTS, "om1_list", None)
+            if om_list is None:
+                om_list = _SELECTION_LISTS.om1_list = om1.MSelectionList()
+            om_list.clear()
             om_list.add(self.name)
             self._MPlug1 = om1.MPlug()
             om_list.getPlug(0, self._MPlug1)
@@ -236,9 +366,19 @@ class Attribute(nodes.Yam):
                         rf"¯\_(ツ)_/¯ {self.name} {attr}"
                     )
 
-        # Regular MPlug getting if not using singleton or children attribute not generated.
-        MPlug = getMPlug(f"{self.name}.{attr}")
-        attribute = Attribute(MPlug, self.node)
+        # Getting the child MPlug from the node attribute directly, avoiding building and parsing the full name.
+        MPlug = None
+        if self.MPlug.isCompound:
+            attribute_obj = self.node.MFn.attribute(attr)
+            if not attribute_obj.isNull():
+                try:
+                    MPlug = self.MPlug.child(attribute_obj)
+                except (RuntimeError, ValueError):
+                    MPlug = None
+        # Regular MPlug getting if the attr is not a direct child of this attribute.
+        if MPlug is None or MPlug.isNull:
+            MPlug = getMPlug(f"{self.name}.{attr}")
+        attribute = Attribute._fromMPlug(MPlug, self.node)
         self._attributes[attr] = attribute
         return attribute
 
@@ -258,7 +398,7 @@ class Attribute(nodes.Yam):
         self._children = []
         for index in range(self.MPlug.numChildren()):
             child = self.MPlug.child(index)
-            attribute = Attribute(child, self.node)
+            attribute = Attribute._fromMPlug(child, self.node)
             name = child.partialName(useLongNames=True, includeInstancedIndices=True).split(".")[-1]
             short_name = child.partialName(includeInstancedIndices=True).split(".")[-1]
             self._attributes[name] = attribute
@@ -266,6 +406,13 @@ class Attribute(nodes.Yam):
             self._children.append(attribute)
         self._children_generated = True
 
+    def clearCache(self):
+        """Clears the cached children and array element Attributes; they get regenerated on next access."""
+        self._attributes = {}
+        self._elements.clear()
+        self._children = []
+        self._children_generated = False
+
     def hasattr(self, attr):
         return checks.objExists(f"{self}.{attr}")
 
@@ -308,9 +455,21 @@ class Attribute(nodes.Yam):
     def exists(self):
         """
         Checks if the attribute exists.
+        Uses the api on the node for non-element attributes, and cmds.objExists for array elements and any child
+        under an array element, as the node has the attribute even when the element does not exist.
         :return: bool
         """
-        return checks.objExists(self)
+        MPlug = self.MPlug
+        plug = MPlug
+        while True:
+            if plug.isElement:
+                return checks.objExists(self.name)
+            if not plug.isChild:
+                break
+            plug = plug.parent()
+        if not om.MObjectHandle(self.node.MObject).isValid():
+            return False
+        return self.node.MFn.hasAttribute(om.MFnAttribute(MPlug.attribute()).name)
 
     @property
     def index(self):
@@ -326,7 +485,7 @@ class Attribute(nodes.Yam):
         :return: Attribute object
         """
         if self.MPlug.isElement:
-            return Attribute(self.MPlug.array(), self.node)
+            return Attribute._fromMPlug(self.MPlug.array(), self.node)
         else:
             return Attribute(self.MPlug.parent(), self.node)
 
@@ -343,7 +502,7 @@ class Attribute(nodes.Yam):
         Connect this attribute to the given attr.
         kwargs are passed on to cmds.connectAttr
         """
-        if isinstance(attr, Attribute):
+        if hasattr(attr, "isAYamAttribute"):
             attr = attr.name
         cmds.connectAttr(self.name, attr, **kwargs)
 
@@ -352,7 +511,7 @@ class Attribute(nodes.Yam):
         Connect the given attr to this attribute.
         kwargs are passed on to cmds.connectAttr
         """
-        if isinstance(attr, Attribute):
+        if hasattr(attr, "isAYamAttribute"):
             attr = attr.name
         cmds.connectAttr(attr, self.name, **kwargs)
 
@@ -361,7 +520,7 @@ class Attribute(nodes.Yam):
         Disconnect the connection between self (source) and attr (destination)
         :param attr: str or Attribute
         """
-        if isinstance(attr, Attribute):
+        if hasattr(attr, "isAYamAttribute"):
             attr = attr.name
         cmds.disconnectAttr(self.name, attr)
 
@@ -372,10 +531,13 @@ class Attribute(nodes.Yam):
         :param kwargs: kwargs to pass on to cmds.listConnections
         :return: YamList of Attribute or Yam node objects.
         """
-        if "scn" not in kwargs and "skipConversionNodes" not in kwargs:
-            kwargs["skipConversionNodes"] = True
-        if "p" not in kwargs and "plugs" not in kwargs:
-            kwargs["plugs"] = True
+        if kwargs:
+            for short, long in _LISTCONNECTIONS_SHORT_FLAGS.items():
+                if short in kwargs:
+                    kwargs[long] = kwargs.pop(short)
+            kwargs = {**_LISTCONNECTIONS_DEFAULTS, **kwargs}
+        else:
+            kwargs = _LISTCONNECTIONS_DEFAULTS
         return nodes.yams(cmds.listConnections(self.name, **kwargs) or [])
 
     def input(self, **kwargs):
@@ -406,6 +568,27 @@ class Attribute(nodes.Yam):
             connection.disconnect(self)
             return connection
 
+    def breakOutputConnections(self):
+        """
+        Disconnects all the output connections of this attribute.
+        If config.undoable is False, disconnects them all at once with a single MDGModifier, otherwise uses
+        cmds.disconnectAttr for each of them.
+        :return: YamList of the previously connected Attribute objects.
+        """
+        MPlug = self.MPlug
+        destinations = MPlug.destinations()
+        connections = nodes.YamList(Attribute(destination) for destination in destinations)
+        if not config.undoable:
+            modifier = om.MDGModifier()
+            for destination in destinations:
+                modifier.disconnect(MPlug, destination)
+            modifier.doIt()
+        else:
+            name = self.name
+            for connection in connections:
+                cmds.disconnectAttr(name, connection.name)
+        return connections
+
     def listAttr(self, **kwargs):
         """
         List the attributes of this attribute via cmds.listAttr.
@@ -414,6 +597,25 @@ class Attribute(nodes.Yam):
         """
         return nodes.listAttr(self, **kwargs)
 
+    def _isUnitlessNumericCompound(self):
+        """
+        Checks if the attribute is a numeric compound with only unitless children, e.g.: scale, color, that can be read
+        at once with MFnNumericData; distance and angle children need a unit conversion.
+        :return: bool
+        """
+        if self._unitless_compound is None:
+            MPlug = self.MPlug
+            child = MPlug.child
+            self._unitless_compound = (
+                not MPlug.isArray
+                and MPlug.attribute().apiType() in _NUMERIC_COMPOUND_TYPES
+                and all(
+                    child(i).attribute().apiType() == om.MFn.kNumericAttribute
+                    for i in range(MPlug.numChildren())
+                )
+            )
+        return self._unitless_compound
+
     def types(self):
         if self._types is None:
             self._types = ["attribute", cmds.getAttr(self.name, type=True)]
@@ -499,8 +701,10 @@ class Attribute(nodes.Yam):
         """
         When value is False, sets the attribute as channelBox (displayable).
         """
-        cmds.setAttr(self.name, channelBox=True)
-        cmds.setAttr(self.name, keyable=value)
+        if value:
+            cmds.setAttr(self.name, keyable=True)
+        else:
+            cmds.setAttr(self.name, keyable=False, channelBox=True)
 
     @property
     def channelBox(self):
@@ -511,30 +715,23 @@ class Attribute(nodes.Yam):
         """
         When value is False, sets the attribute as hidden.
         """
-        if value:
-            cmds.setAttr(self.name, keyable=False)
-            cmds.setAttr(self.name, channelBox=True)
-        else:
-            cmds.setAttr(self.name, keyable=False)
-            cmds.setAttr(self.name, channelBox=False)
+        cmds.setAttr(self.name, keyable=False, channelBox=bool(value))
 
     @property
     def hidden(self):
-        if self.keyable or self.channelBox:
-            return False
-        return True
+        MPlug = self.MPlug
+        return not (MPlug.isKeyable or MPlug.isChannelBox)
 
     @hidden.setter
     def hidden(self, value):
         """
         When value is False, sets the attribute as channelBox (displayable).
         """
-        if value:
-            cmds.setAttr(self.name, keyable=False)
-            cmds.setAttr(self.name, channelBox=False)
-        else:
-            cmds.setAttr(self.name, keyable=False)
-            cmds.setAttr(self.name, channelBox=True)
+        MPlug = self.MPlug
+        # Skipping the setAttr if the attribute is already in the wanted state
+        if not MPlug.isKeyable and MPlug.isChannelBox == (not value):
+            return
+        cmds.setAttr(self.name, keyable=False, channelBox=not value)
 
     @property
     def niceName(self):
@@ -552,6 +749,11 @@ class Attribute(nodes.Yam):
 
     @property
     def alias(self):
+        """
+        The attribute alias if it has one, otherwise its long name.
+        Read from the MPlug on each call, so aliases and renames made outside of this object are always reflected.
+        :return: str
+        """
         return self.MPlug.partialName(
             useAlias=True,
             useLongNames=True,
@@ -596,14 +798,18 @@ class Attribute(nodes.Yam):
     def isArray(self):
         return self.MPlug.isArray
 
-    def nextAvailableElement(self):
+    def nextAvailableElement(self, hint=None):
         """
         Gets an Attribute for the next available array element of this attribute.
 
+        @param hint: int, index of the last used element if known, e.g. when adding many elements in a row; skips
+                     querying the existing indices.
         @return: Attribute
         """
         if not self.isArray():
             raise RuntimeError("The attribute {} is not an array attribute.".format(repr(self)))
+        if hint is not None:
+            return self[hint + 1]
         existing_indices = self.indices() or [-1]
         next_index = existing_indices[-1] + 1
         return self[next_index]
@@ -618,24 +824,37 @@ class Attribute(nodes.Yam):
 
 
 class BlendShapeTarget(Attribute):
+    __slots__ = ("_inputTargetGroupAttr", "_weightsAttr")
+
     def __init__(self, MPlug, node=None):
         super().__init__(MPlug, node)
 
+    def _initAttribute(self, MPlug, node):
+        super()._initAttribute(MPlug, node)
+        self._inputTargetGroupAttr = None
+        self._weightsAttr = None
+
     @property
     def inputTargetGroupAttr(self):
-        return self.node.inputTarget[0].inputTargetGroup[self.index]
+        # Cached as the target index does not change, avoiding three plug lookups on each call
+        if self._inputTargetGroupAttr is None:
+            self._inputTargetGroupAttr = self.node.inputTarget[0].inputTargetGroup[self.index]
+        return self._inputTargetGroupAttr
 
     @property
     def weightsAttr(self):
-        return self.inputTargetGroupAttr.targetWeights
+        if self._weightsAttr is None:
+            self._weightsAttr = self.inputTargetGroupAttr.targetWeights
+        return self._weightsAttr
 
     def getWeights(self, force_clamp=True, min_value=0.0, max_value=1.0, round_value=None):
         geometry = self.node.geometry
         if not geometry:
             raise RuntimeError(f"Deformer '{self.node}' is not connected to a geometry")
-        weightsAttr = self.weightsAttr
+        # Reading the elements MPlug directly instead of creating an Attribute object for each weight.
+        elementByLogicalIndex = self.weightsAttr.MPlug.elementByLogicalIndex
         return weightlist.WeightList(
-            (weightsAttr[x].value for x in range(len(geometry))),
+            [elementByLogicalIndex(i).asDouble() for i in range(len(geometry))],
             force_clamp=force_clamp,
             min_value=min_value,
             max_value=max_value,
@@ -644,8 +863,16 @@ class BlendShapeTarget(Attribute):
 
     def setWeights(self, weights):
         weightsAttr = self.weightsAttr
-        for i, weight in enumerate(weights):
-            weightsAttr[i].value = weight
+        if not config.undoable:
+            # Setting the elements MPlug directly instead of creating an Attribute object for each weight.
+            elementByLogicalIndex = weightsAttr.MPlug.elementByLogicalIndex
+            for i, weight in enumerate(weights):
+                elementByLogicalIndex(i).setDouble(weight)
+            return
+        # Setting all the weights in a single undoable call using a multi index range.
+        weights = list(weights)
+        if weights:
+            cmds.setAttr(f"{weightsAttr.name}[0:{len(weights) - 1}]", *weights)
 
     @property
     def weights(self):
@@ -673,11 +900,15 @@ class BlendShapeTarget(Attribute):
         Returns:
             dict : {target value: {influenced component: list of x, y, z component delta}}
         """
-        return {value: self.getDelta(value) for value in self.values()}
+        # Using the item indices directly instead of converting the target values back to item indices in getDelta.
+        return {
+            round(item_index / 1000.0 - 5, 6): self.getDelta(None, item_index=item_index)
+            for item_index in self.inputTaregetItemIndices()
+        }
 
     def setDeltas(self, deltas):
         """Sets the given delta data on the corresponding inputTargetItem"""
-        inputTargetItem = self.node.inputTarget[0].inputTargetGroup[self.index].inputTargetItem
+        inputTargetItem = self.inputTargetGroupAttr.inputTargetItem
         for shape_value, data in deltas.items():
             # Needed if data comes from a json file with str keys
             shape_value = float(shape_value)
@@ -705,10 +936,9 @@ class BlendShapeTarget(Attribute):
                 "At least one of target_value or item_index needed to get deltas; got None."
             )
 
-        delta_values = self.inputTargetGroupAttr.inputTargetItem[item_index].inputPointsTarget.value
-        component_indices = self.inputTargetGroupAttr.inputTargetItem[
-            item_index
-        ].inputComponentsTarget.value
+        inputTargetItem = self.inputTargetGroupAttr.inputTargetItem[item_index]
+        delta_values = inputTargetItem.inputPointsTarget.value
+        component_indices = inputTargetItem.inputComponentsTarget.value
         if component_indices and isinstance(component_indices[0], str):
             component_indices = mayautils.componentListToIndices(component_indices)
         if len(delta_values) != len(component_indices):
@@ -720,14 +950,13 @@ class BlendShapeTarget(Attribute):
 
     def setDelta(self, value, delta, inputTargetItem=None):
         if not inputTargetItem:
-            inputTargetItem = self.node.inputTarget[0].inputTargetGroup[self.index].inputTargetItem
+            inputTargetItem = self.inputTargetGroupAttr.inputTargetItem
 
         item_index = int(value * 1000 + 5000)
 
         plug = inputTargetItem[item_index]
-        component_indexes = list(delta)
         # Needed if components come from a json file with str keys
-        component_indexes = [int(x) for x in component_indexes]
+        component_indexes = list(map(int, delta))
         delta_values = list(delta.values())
         plug.inputPointsTarget.value = delta_values
         plug.inputComponentsTarget.value = component_indexes
@@ -789,13 +1018,19 @@ class BlendShapeTarget(Attribute):
             mel.eval(f'blendShapeDeleteTargetGroup("{self.node.name}", "{self.index}");')
 
 
-def getAttr(attr: Attribute):
+def getAttr(attr):
     """
     Gets the attribute value.
-    :param attr: Attribute object
+    :param attr: Attribute object or 'node.attr' str
     :return: the value of the attribute.
     """
-    MPlug = attr.MPlug
+    if hasattr(attr, "isAYamAttribute"):
+        MPlug = attr.MPlug
+        # Reading all the values in one call for compounds of unitless numeric values, e.g.: scale, color.
+        if attr._isUnitlessNumericCompound():
+            return list(om.MFnNumericData(MPlug.asMObject()).getData())
+    else:  # Getting the MPlug directly without creating an Attribute object
+        MPlug = getMPlug(attr)
     # if not MPlug.isArray:  # Getting full array is usually faster using cmds
     try:
         return getMPlugValue(MPlug)
@@ -805,16 +1040,34 @@ def getAttr(attr: Attribute):
     except RuntimeError as e:
         raise RuntimeError(f"## Failed to get MPlug value on '{MPlug.name()}': {e}")
 
-    value = cmds.getAttr(attr.name)
+    value = cmds.getAttr(str(attr))
     # Fixing cmds.getattr to simply return the tuple in the list that cmds returns for attribute like '.translate',
     # '.rotate', etc...
-    if (
-        value.__class__ == list and len(value) == 1 and value[0].__class__ == tuple
-    ):  # Not isinstance() for efficiency
+    # Not using isinstance() for efficiency
+    if value.__class__ is list and len(value) == 1 and value[0].__class__ is tuple:
         return value[0]
     return value
 
 
+def getAttrs(attrs):
+    """
+    Gets the values of all the given attributes.
+    Given 'node.attr' str are read through their MPlug without creating any node or Attribute object, which is faster
+    than getting the value of each Attribute when reading many plugs.
+    :param attrs: list of Attribute objects and/or 'node.attr' str
+    :return: list of the attributes values
+    """
+    return [getAttr(attr) for attr in attrs]
+
+
+# cmds attribute types set by setAttr with their values unpacked as args.
+_SET_ATTR_UNPACKED_TYPES = frozenset(
+    ("double2", "double3", "float2", "float3", "long2", "long3", "short2", "matrix")
+)
+# cmds attribute types set by setAttr with their values size given as first arg.
+_SET_ATTR_SIZED_TYPES = frozenset(("componentList", "pointArray"))
+
+
 def setAttr(attr, value, **kwargs):
     """
     Sets the attribute value.
@@ -834,191 +1087,335 @@ def setAttr(attr, value, **kwargs):
             raise RuntimeError(f"## Failed to get MPlug value on '{MPlug.name()}': {e}")
 
     attr_type = attr.type()
-    if attr_type in [
-        "double2",
-        "double3",
-        "float2",
-        "float3",
-        "long2",
-        "long3",
-        "short2",
-        "matrix",
-    ]:
+    if attr_type in _SET_ATTR_UNPACKED_TYPES:
         cmds.setAttr(attr.name, *value, type=attr_type)
     elif attr_type == "string":
         cmds.setAttr(attr.name, value, type=attr_type)
     elif attr_type == "TdataCompound":
         cmds.setAttr(attr.name + "[:]", *value, size=len(value))
-    elif attr_type in ["componentList", "pointArray"]:
+    elif attr_type in _SET_ATTR_SIZED_TYPES:
         if attr_type == "componentList":
             # TODO: make work with other than vtx
             # If given a list of integers, tries to set them as vertex components
+            # Consecutive indices are packed into ranges to keep the number of components passed to cmds low.
             if isinstance(value, (list, tuple)) and all(isinstance(x, int) for x in value):
-                value = [f"vtx[{x}]" for x in value]
+                value = mayautils.indicesToComponentList(value)
         cmds.setAttr(attr.name, len(value), *value, type=attr_type)
     else:
         cmds.setAttr(attr.name, value, **kwargs)
 
 
+def _getDoubleValue(MPlug):
+    return MPlug.asDouble()
+
+
+def _getIntValue(MPlug):
+    return MPlug.asInt()
+
+
+def _getDistanceValue(MPlug):
+    return MPlug.asMDistance().asUnits(_DISTANCE_UI_UNIT)
+
+
+def _getAngleValue(MPlug):
+    return MPlug.asMAngle().asUnits(_ANGLE_UI_UNIT)
+
+
+def _getTimeValue(MPlug):
+    return MPlug.asMTime().asUnits(_TIME_UI_UNIT)
+
+
+def _getMatrixValue(MPlug):
+    return list(MPlug.asMDataHandle().asMatrix())
+
+
+def _getFloatMatrixValue(MPlug):
+    return list(MPlug.asMDataHandle().asFloatMatrix())
+
+
+def _getStringValue(MPlug):
+    return MPlug.asString()
+
+
+def _getMatrixDataValue(MPlug):
+    return list(om.MFnMatrixData(MPlug.asMObject()).matrix())
+
+
+def _getPointArrayValue(MPlug):
+    # TODO: fails to get MPlug.asMObject() if empty data
+    try:
+        mfn = om.MFnPointArrayData(MPlug.asMObject())
+    except RuntimeError:
+        return []
+    return list(map(mayautils.getXYZ, mfn.array()))
+
+
+def _getComponentListValue(MPlug):
+    try:
+        mfn = om.MFnComponentListData(MPlug.asMObject())
+    except RuntimeError:
+        return []
+    elements = []
+    for i in range(mfn.length()):
+        component = mfn.get(i)
+        # Single indexed components, e.g.: mesh vertices
+        if component.hasFn(om.MFn.kSingleIndexedComponent):
+            component_mfn = om.MFnSingleIndexedComponent(component)
+            type_preffix = components.SupportedTypes.MFNID_COMPONENT_CLASS[
+                component_mfn.componentType
+            ][0]
+            elements += map(f"{type_preffix}[{{}}]".format, component_mfn.getElements())
+        # Double indexed components, e.g.: surface cvs
+        elif component.hasFn(om.MFn.kDoubleIndexedComponent):
+            component_mfn = om.MFnDoubleIndexedComponent(component)
+            type_preffix = components.SupportedTypes.MFNID_COMPONENT_CLASS[
+                component_mfn.componentType
+            ][0]
+            elements += [f"{type_preffix}[{x}][{y}]" for x, y in component_mfn.getElements()]
+        # Triple indexed components, e.g.: lattice point
+        else:
+            component_mfn = om.MFnTripleIndexedComponent(component)
+            type_preffix = components.SupportedTypes.MFNID_COMPONENT_CLASS[
+                component_mfn.componentType
+            ][0]
+            elements += [
+                f"{type_preffix}[{x}][{y}][{z}]" for x, y, z in component_mfn.getElements()
+            ]
+    return elements
+
+
+# Attribute api types found not supported by getMPlugValue, failing right away for them without going through the
+# typed and compound checks.
+_UNSUPPORTED_API_TYPES = set()
+
+# getMPlugValue handlers per attribute api type.
+_GET_MPLUG_VALUE_HANDLERS = {
+    om.MFn.kNumericAttribute: _getDoubleValue,
+    om.MFn.kDoubleLinearAttribute: _getDoubleValue,
+    om.MFn.kEnumAttribute: _getIntValue,
+    om.MFn.kDistance: _getDistanceValue,
+    om.MFn.kAngle: _getAngleValue,
+    om.MFn.kDoubleAngleAttribute: _getAngleValue,
+    om.MFn.kTimeAttribute: _getTimeValue,
+    om.MFn.kMatrixAttribute: _getMatrixValue,
+    om.MFn.kFloatMatrixAttribute: _getFloatMatrixValue,
+}
+
+# Numeric compound attribute api types whose values can be read at once with MFnNumericData.
+_NUMERIC_COMPOUND_TYPES = frozenset(
+    (
+        om.MFn.kAttribute2Double,
+        om.MFn.kAttribute2Float,
+        om.MFn.kAttribute3Double,
+        om.MFn.kAttribute3Float,
+        om.MFn.kAttribute4Double,
+    )
+)
+
+# getMPlugValue handlers per MFnData type of typed attributes.
+_GET_TYPED_MPLUG_VALUE_HANDLERS = {
+    om.MFnData.kString: _getStringValue,
+    om.MFnData.kMatrix: _getMatrixDataValue,
+    om.MFnData.kPointArray: _getPointArrayValue,
+    om.MFnData.kComponentList: _getComponentListValue,
+}
+
+
 def getMPlugValue(MPlug):
     if MPlug.isArray:
-        return [
-            getMPlugValue(MPlug.elementByLogicalIndex(i))
-            for i in MPlug.getExistingArrayAttributeIndices()
-        ]
+        indices = MPlug.getExistingArrayAttributeIndices()
+        elementByLogicalIndex = MPlug.elementByLogicalIndex
+        # All elements share the array attribute type, simple types are read directly with their handler.
+        handler = _GET_MPLUG_VALUE_HANDLERS.get(MPlug.attribute().apiType())
+        if handler is not None:
+            return [handler(elementByLogicalIndex(i)) for i in indices]
+        return [getMPlugValue(elementByLogicalIndex(i)) for i in indices]
     attribute = MPlug.attribute()
     attr_type = attribute.apiType()
-    if attr_type in (om.MFn.kNumericAttribute, om.MFn.kDoubleLinearAttribute):
-        return MPlug.asDouble()
-    elif attr_type == om.MFn.kEnumAttribute:
-        return MPlug.asInt()
-    elif attr_type == om.MFn.kDistance:
-        return MPlug.asMDistance().asUnits(om.MDistance.uiUnit())
-    elif attr_type in (om.MFn.kAngle, om.MFn.kDoubleAngleAttribute):
-        return MPlug.asMAngle().asUnits(om.MAngle.uiUnit())
+    handler = _GET_MPLUG_VALUE_HANDLERS.get(attr_type)
+    if handler is not None:
+        return handler(MPlug)
+    elif attr_type in _UNSUPPORTED_API_TYPES:
+        raise NotImplementedError(
+            f"Attribute '{MPlug.name()}' of type '{nodes.MFN_TYPE_NAMES[attr_type]}' not supported"
+        )
     elif attr_type == om.MFn.kTypedAttribute:
-        mfn = om.MFnTypedAttribute(attribute)
-        attr_type = mfn.attrType()
-        if attr_type == om.MFnData.kString:
-            return MPlug.asString()
-        elif attr_type == om.MFnData.kMatrix:
-            mfn = om.MFnMatrixData(MPlug.asMObject())
-            return list(mfn.matrix())
-        elif attr_type == om.MFnData.kPointArray:
-            # TODO: fails to get MPlug.asMObject() if empty data
-            try:
-                mfn = om.MFnPointArrayData(MPlug.asMObject())
-            except RuntimeError:
-                return []
-            return [(x.x, x.y, x.z) for x in mfn.array()]
-        elif attr_type == om.MFnData.kComponentList:
-            from . import components
-
-            try:
-                mfn = om.MFnComponentListData(MPlug.asMObject())
-            except RuntimeError:
-                return []
-            elements = []
-            for i in range(mfn.length()):
-                component = mfn.get(i)
-                # Single indexed components, e.g.: mesh vertices
-                if component.hasFn(om.MFn.kSingleIndexedComponent):
-                    component_mfn = om.MFnSingleIndexedComponent(component)
-                    type_preffix = components.SupportedTypes.MFNID_COMPONENT_CLASS[
-                        component_mfn.componentType
-                    ][0]
-                    elements += [f"{type_preffix}[{x}]" for x in component_mfn.getElements()]
-                # Double indexed components, e.g.: surface cvs
-                elif component.hasFn(om.MFn.kDoubleIndexedComponent):
-                    component_mfn = om.MFnDoubleIndexedComponent(component)
-                    type_preffix = components.SupportedTypes.MFNID_COMPONENT_CLASS[
-                        component_mfn.componentType
-                    ][0]
-                    elements += [
-                        f"{type_preffix}[{x}][{y}]" for x, y in component_mfn.getElements()
-                    ]
-                # Triple indexed components, e.g.: lattice point
-                else:
-                    component_mfn = om.MFnTripleIndexedComponent(component)
-                    type_preffix = components.SupportedTypes.MFNID_COMPONENT_CLASS[
-                        component_mfn.componentType
-                    ][0]
-                    elements += [
-                        f"{type_preffix}[{x}][{y}][{z}]" for x, y, z in component_mfn.getElements()
-                    ]
-            return elements
-        else:
+        attr_type = om.MFnTypedAttribute(attribute).attrType()
+        handler = _GET_TYPED_MPLUG_VALUE_HANDLERS.get(attr_type)
+        if handler is None:
             raise NotImplementedError(
                 f"Attribute '{MPlug.name()}' of MFnData type {attr_type} not supported."
             )
-    elif attr_type == om.MFn.kTimeAttribute:
-        return MPlug.asMTime().asUnits(om.MTime.uiUnit())
-    elif attr_type in (om.MFn.kMatrixAttribute, om.MFn.kFloatMatrixAttribute):
-        data_handle = MPlug.asMDataHandle()
-        if attr_type == om.MFn.kMatrixAttribute:
-            return list(data_handle.asMatrix())
-        elif attr_type == om.MFn.kFloatMatrixAttribute:
-            return list(data_handle.asFloatMatrix())
+        return handler(MPlug)
     elif MPlug.isCompound:
         values = []
+        child = MPlug.child
         for child_index in range(MPlug.numChildren()):
-            values.append(getMPlugValue(MPlug.child(child_index)))
+            child_plug = child(child_index)
+            # Simple leaf children are read directly with their handler instead of recursing.
+            handler = None
+            if not child_plug.isArray:
+                handler = _GET_MPLUG_VALUE_HANDLERS.get(child_plug.attribute().apiType())
+            if handler is not None:
+                values.append(handler(child_plug))
+            else:
+                values.append(getMPlugValue(child_plug))
         return values
     else:
+        _UNSUPPORTED_API_TYPES.add(attr_type)
         raise NotImplementedError(
             f"Attribute '{MPlug.name()}' of type '{nodes.MFN_TYPE_NAMES[attr_type]}' not supported"
         )
 
 
+def _setDoubleValue(MPlug, value):
+    MPlug.setDouble(value)
+
+
+def _setIntValue(MPlug, value):
+    MPlug.setInt(value)
+
+
+def _setDistanceValue(MPlug, value):
+    distance = getattr(_UNIT_VALUES, "distance", None)
+    if distance is None:
+        distance = _UNIT_VALUES.distance = om.MDistance()
+    distance.unit = _DISTANCE_UI_UNIT
+    distance.value = value
+    MPlug.setMDistance(distance)
+
+
+def _setAngleValue(MPlug, value):
+    angle = getattr(_UNIT_VALUES, "angle", None)
+    if angle is None:
+        angle = _UNIT_VALUES.angle = om.MAngle()
+    angle.unit = _ANGLE_UI_UNIT
+    angle.value = value
+    MPlug.setMAngle(angle)
+
+
+def _setTimeValue(MPlug, value):
+    time = getattr(_UNIT_VALUES, "time", None)
+    if time is None:
+        time = _UNIT_VALUES.time = om.MTime()
+    time.unit = _TIME_UI_UNIT
+    time.value = value
+    MPlug.setMTime(time)
+
+
+def _setMatrixValue(MPlug, value):
+    data_handle = MPlug.asMDataHandle()
+    data_handle.setMMatrix(value)
+    MPlug.setMDataHandle(data_handle)
+
+
+def _setFloatMatrixValue(MPlug, value):
+    data_handle = MPlug.asMDataHandle()
+    data_handle.setMFloatMatrix(value)
+    MPlug.setMDataHandle(data_handle)
+
+
+def _setStringValue(MPlug, value):
+    MPlug.setString(value)
+
+
+def _setPointArrayValue(MPlug, value):
+    array = om.MPointArray([om.MPoint(x) for x in value])
+    data = om.MFnPointArrayData().create(array)
+    MPlug.setMObject(data)
+
+
+def _setMatrixDataValue(MPlug, value):
+    matrix = om.MMatrix(value)
+    data = om.MFnMatrixData().create(matrix)
+    MPlug.setMObject(data)
+
+
+def _setComponentListValue(MPlug, value):
+    # Getting a proper MFnComponentData
+    mfnd = om.MFnComponentListData(MPlug.asMObject())
+    # TODO : Fails to .get if empty list
+    mo = mfnd.get(0)
+
+    # Getting a proper MFn*IndexedComponent
+    if mo.hasFn(om.MFn.kSingleIndexedComponent):
+        mfn = om.MFnSingleIndexedComponent
+    elif mo.hasFn(om.MFn.kDoubleIndexedComponent):
+        mfn = om.MFnDoubleIndexedComponent
+    elif mo.hasFn(om.MFn.kTripleIndexedComponent):
+        mfn = om.MFnTripleIndexedComponent
+    mfn = mfn(mo)
+    # Clearing it by creating a new one with the mo type
+    new_mo = mfn.create(getattr(om.MFn, mo.apiTypeStr))
+    # Adding the wanted indexes
+    mfn.addElements(value)
+
+    # Clearing the MFnComponentData and adding the new MFn*IndexedComponent to it
+    mfnd.clear()
+    mfnd.add(new_mo)
+    # Setting the MObject on the MPlug
+    MPlug.setMObject(mfnd.object())
+
+
+# setMPlugValue handlers per attribute api type.
+_SET_MPLUG_VALUE_HANDLERS = {
+    om.MFn.kNumericAttribute: _setDoubleValue,
+    om.MFn.kDoubleLinearAttribute: _setDoubleValue,
+    om.MFn.kEnumAttribute: _setIntValue,
+    om.MFn.kDistance: _setDistanceValue,
+    om.MFn.kAngle: _setAngleValue,
+    om.MFn.kDoubleAngleAttribute: _setAngleValue,
+    om.MFn.kTimeAttribute: _setTimeValue,
+    om.MFn.kMatrixAttribute: _setMatrixValue,
+    om.MFn.kFloatMatrixAttribute: _setFloatMatrixValue,
+}
+
+# setMPlugValue handlers per MFnData type of typed attributes.
+_SET_TYPED_MPLUG_VALUE_HANDLERS = {
+    om.MFnData.kString: _setStringValue,
+    om.MFnData.kMatrix: _setMatrixDataValue,
+    om.MFnData.kPointArray: _setPointArrayValue,
+    om.MFnData.kComponentList: _setComponentListValue,
+}
+
+
 def setMPlugValue(MPlug, value):
     if MPlug.isArray:
-        return [
-            setMPlugValue(MPlug.elementByLogicalIndex(i), value)
-            for i in MPlug.getExistingArrayAttributeIndices()
-        ]
+        # Plain loop, the list of None returned by a list comprehension was never used.
+        elementByLogicalIndex = MPlug.elementByLogicalIndex
+        for i in MPlug.getExistingArrayAttributeIndices():
+            setMPlugValue(elementByLogicalIndex(i), value)
+        return
     attribute = MPlug.attribute()
     attr_type = attribute.apiType()
-    if attr_type in (om.MFn.kNumericAttribute, om.MFn.kDoubleLinearAttribute):
-        MPlug.setDouble(value)
-    elif attr_type == om.MFn.kEnumAttribute:
-        return MPlug.setInt(value)
-    elif attr_type == om.MFn.kDistance:
-        MPlug.setMDistance(om.MDistance(value, om.MDistance.uiUnit()))
-    elif attr_type in (om.MFn.kAngle, om.MFn.kDoubleAngleAttribute):
-        MPlug.setMAngle(om.MAngle(value, om.MAngle.uiUnit()))
+    handler = _SET_MPLUG_VALUE_HANDLERS.get(attr_type)
+    if handler is not None:
+        handler(MPlug, value)
     elif attr_type == om.MFn.kTypedAttribute:
-        mfn = om.MFnTypedAttribute(attribute)
-        attr_type = mfn.attrType()
-        if attr_type == om.MFnData.kString:
-            MPlug.setString(value)
-        elif attr_type == om.MFnData.kPointArray:
-            array = om.MPointArray([om.MPoint(x) for x in value])
-            data = om.MFnPointArrayData().create(array)
-            MPlug.setMObject(data)
-        elif attr_type == om.MFnData.kMatrix:
-            matrix = om.MMatrix(value)
-            data = om.MFnMatrixData().create(matrix)
-            MPlug.setMObject(data)
-        elif attr_type == om.MFnData.kComponentList:
-            # Getting a proper MFnComponentData
-            mfnd = om.MFnComponentListData(MPlug.asMObject())
-            # TODO : Fails to .get if empty list
-            mo = mfnd.get(0)
-
-            # Getting a proper MFn*IndexedComponent
-            if mo.hasFn(om.MFn.kSingleIndexedComponent):
-                mfn = om.MFnSingleIndexedComponent
-            elif mo.hasFn(om.MFn.kDoubleIndexedComponent):
-                mfn = om.MFnDoubleIndexedComponent
-            elif mo.hasFn(om.MFn.kTripleIndexedComponent):
-                mfn = om.MFnTripleIndexedComponent
-            mfn = mfn(mo)
-            # Clearing it by creating a new one with the mo type
-            new_mo = mfn.create(getattr(om.MFn, mo.apiTypeStr))
-            # Adding the wanted indexes
-            mfn.addElements(value)
-
-            # Clearing the MFnComponentData and adding the new MFn*IndexedComponent to it
-            mfnd.clear()
-            mfnd.add(new_mo)
-            # Setting the MObject on the MPlug
-            MPlug.setMObject(mfnd.object())
-        else:
+        attr_type = om.MFnTypedAttribute(attribute).attrType()
+        handler = _SET_TYPED_MPLUG_VALUE_HANDLERS.get(attr_type)
+        if handler is None:
             raise NotImplementedError(
                 f"Attribute of MFnData type '{nodes.MFNDATA_TYPE_NAMES[attr_type]}' not supported"
             )
-    elif attr_type == om.MFn.kTimeAttribute:
-        MPlug.setMTime(om.MTime(value, om.MTime.uiUnit()))
-    elif attr_type in (om.MFn.kMatrixAttribute, om.MFn.kFloatMatrixAttribute):
-        data_handle = MPlug.asMDataHandle()
-        if attr_type == om.MFn.kMatrixAttribute:
-            data_handle.setMMatrix(value)
-        elif attr_type == om.MFn.kFloatMatrixAttribute:
-            data_handle.setMFloatMatrix(value)
-        MPlug.setMDataHandle(data_handle)
+        handler(MPlug, value)
     elif MPlug.isCompound:
-        for child_index in range(MPlug.numChildren()):
-            setMPlugValue(MPlug.child(child_index), value[child_index])
+        num_children = MPlug.numChildren()
+        if len(value) != num_children:
+            raise ValueError(
+                f"Attribute '{MPlug.name()}' has {num_children} children, got {len(value)} values"
+            )
+        child = MPlug.child
+        for child_index in range(num_children):
+            child_plug = child(child_index)
+            # Simple leaf children are set directly with their handler instead of recursing.
+            handler = None
+            if not child_plug.isArray:
+                handler = _SET_MPLUG_VALUE_HANDLERS.get(child_plug.attribute().apiType())
+            if handler is not None:
+                handler(child_plug, value[child_index])
+            else:
+                setMPlugValue(child_plug, value[child_index])
     else:
         raise NotImplementedError(
             f"Attribute '{MPlug.name()}' of type '{nodes.MFN_TYPE_NAMES[attr_type]}' not supported"
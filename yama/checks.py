@@ -12,7 +12,8 @@ class ObjExistsError(Exception):
 
 
 def objExists(obj, raiseError=False, verbose=False):
-    obj = str(obj)
+    if obj.__class__ is not str:  # Not using isinstance() for efficiency
+        obj = str(obj)
     if cmds.objExists(obj):
         return True
     elif raiseError:
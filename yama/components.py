@@ -5,12 +5,17 @@ Contains all the class and functions for maya components.
 """
 # TODO : Improve getComponent func
 # TODO : fix setPositionsOM on cvs ?
-from abc import ABCMeta, abstractmethod
+import itertools
+import re
+from abc import abstractmethod
 
 from maya import cmds
 import maya.api.OpenMaya as om
 
-from . import config, nodes, checks
+from . import config, nodes, checks, decorators, mayautils
+
+# Matches each index between brackets of a component name, e.g.: 'cv[2][0:3]' -> ['2', '0:3']
+_INDEX_RE = re.compile(r"\[([^\]]*)\]")
 
 
 def getComponent(node, attr):
@@ -23,10 +28,9 @@ def getComponent(node, attr):
     if "." in attr:
         raise TypeError(f"Not a supported component : '{attr}'")
 
-    split = []
-    if "[" in attr:  # Checking if getting a specific index
-        split = attr.split("[")
-        attr = split.pop(0)
+    # Splitting the component name from its indices if getting a specific index
+    attr, bracket, indices_str = attr.partition("[")
+    split = _INDEX_RE.findall(bracket + indices_str) if bracket else []
 
     if attr not in SupportedTypes.TYPES:
         raise TypeError(f"component '{attr}' not in supported types")
@@ -41,23 +45,22 @@ def getComponent(node, attr):
         if node.__class__ in SupportedTypes.SHAPE_COMPONENT:
             attr = SupportedTypes.SHAPE_COMPONENT[node.__class__]
 
-    # Getting api_type to get the proper class for the component
-    if (attr, node.__class__) in SupportedTypes.COMPONENT_SHAPE_MFNID:
-        api_type = SupportedTypes.COMPONENT_SHAPE_MFNID[(attr, node.__class__)]
+    # Getting api_type and the proper class for the component
+    entry = _COMPONENT_TABLE.get((attr, node.__class__))
+    if entry is not None:
+        api_type, comp_class = entry
     else:
         om_list = om.MSelectionList()
         om_list.add(f"{node.name}.{attr}[0]")
         dag, comp = om_list.getComponent(0)
         api_type = comp.apiType()
 
-    if api_type not in SupportedTypes.MFNID_COMPONENT_CLASS:
-        raise TypeError(f"component '{attr}' of api type '{api_type}' not in supported types")
-
-    comp_class = SupportedTypes.MFNID_COMPONENT_CLASS[api_type][1]
+        if api_type not in SupportedTypes.MFNID_COMPONENT_CLASS:
+            raise TypeError(f"component '{attr}' of api type '{api_type}' not in supported types")
+        comp_class = SupportedTypes.MFNID_COMPONENT_CLASS[api_type][1]
     component = comp_class(node, api_type)
     indices = []
     for index in split:
-        index = index[:-1]  # Removing the closing ']'
         if index in ["*", ":"]:  # if using the maya wildcard symbols
             indices.append(slice(None))
         elif ":" in index:  # if using a slice to list multiple components
@@ -66,8 +69,8 @@ def getComponent(node, attr):
             indices.append(slice(*slice_args))
         else:
             indices.append(int(index))
-    while indices:
-        component = component[indices.pop(0)]
+    for index in indices:
+        component = component[index]
     return component
 
 
@@ -76,7 +79,7 @@ class Components(nodes.Yam):
     Base class for components not indexed.
     """
 
-    __metaclass__ = ABCMeta
+    __slots__ = ("node", "api_type", "component_name", "component_class", "_types")
 
     def __init__(self, node, apiType):
         super().__init__()
@@ -130,6 +133,7 @@ class Components(nodes.Yam):
     def getPositions(self, ws=False):
         return [x.getPosition(ws=ws) for x in self]
 
+    @decorators.mayaundo
     def setPositions(self, values, ws=False):
         for x, value in zip(self, values):
             x.setPosition(value, ws=ws)
@@ -148,12 +152,17 @@ class SingleIndexed(Components):
     Base class for components indexed by a single index.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def __iter__(self):
+        # Binding the node and class locally and skipping self.index to keep the per component cost low
+        node = self.node
+        component_class = self.component_class
         for i in range(len(self)):
-            yield self.index(i)
+            yield component_class(node, self, i)
 
 
 class MeshVertices(SingleIndexed):
@@ -161,15 +170,14 @@ class MeshVertices(SingleIndexed):
     Class for mesh vertices.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def getPositions(self, ws=False):
-        if ws:
-            space = om.MSpace.kWorld
-        else:
-            space = om.MSpace.kObject
-        return [[p.x, p.y, p.z] for p in self.node.MFn.getPoints(space)]
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
+        return list(map(list, map(mayautils.getXYZ, self.node.MFn.getPoints(space))))
 
     def setPositions(self, values, ws=False):
         if not config.undoable:
@@ -178,10 +186,7 @@ class MeshVertices(SingleIndexed):
             super().setPositions(values, ws)
 
     def setPositionsOM(self, values, ws=False):
-        if ws:
-            space = om.MSpace.kWorld
-        else:
-            space = om.MSpace.kObject
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
         self.node.MFn.setPoints([om.MPoint(x) for x in values], space)
 
 
@@ -190,15 +195,14 @@ class CurveCVs(SingleIndexed):
     Class for curve cvs.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def getPositions(self, ws=False):
-        if ws:
-            space = om.MSpace.kWorld
-        else:
-            space = om.MSpace.kObject
-        return [[p.x, p.y, p.z] for p in self.node.MFn.cvPositions(space)]
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
+        return list(map(list, map(mayautils.getXYZ, self.node.MFn.cvPositions(space))))
 
     def setPositions(self, values, ws=False):
         if not config.undoable:
@@ -207,13 +211,10 @@ class CurveCVs(SingleIndexed):
             super().setPositions(values, ws)
 
     def setPositionsOM(self, values, ws=False):
-        # TODO: doesn't work ? Does but has a refresh issue ?
-        if ws:
-            space = om.MSpace.kWorld
-        else:
-            space = om.MSpace.kObject
-        mps = [om.MPoint(x) for x in values]
-        self.node.MFn.setCVPositions(mps, space)
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
+        mfn = self.node.MFn
+        mfn.setCVPositions([om.MPoint(x) for x in values], space)
+        mfn.updateCurve()
 
 
 class DoubleIndexed(Components):
@@ -221,13 +222,43 @@ class DoubleIndexed(Components):
     Base class for components indexed by two indices.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def __iter__(self):
-        for u in range(self.node.lenU()):
-            for v in range(self.node.lenV()):
-                yield self.index(u, v)
+        node = self.node
+        component_class = self.component_class
+        for u, v in itertools.product(range(node.lenU()), range(node.lenV())):
+            yield component_class(node, self, u, v)
+
+
+class SurfaceCVs(DoubleIndexed):
+    """
+    Class for nurbs surface cvs.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    def getPositions(self, ws=False):
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
+        return list(map(list, map(mayautils.getXYZ, self.node.MFn.cvPositions(space))))
+
+    def setPositions(self, values, ws=False):
+        if not config.undoable:
+            self.setPositionsOM(values, ws)
+        else:
+            super().setPositions(values, ws)
+
+    def setPositionsOM(self, values, ws=False):
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
+        mfn = self.node.MFn
+        mfn.setCVPositions([om.MPoint(x) for x in values], space)
+        mfn.updateSurface()
 
 
 class TripleIndexed(Components):
@@ -235,15 +266,17 @@ class TripleIndexed(Components):
     Base class for components indexed by three indices.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def __iter__(self):
-        lenx, leny, lenz = self.node.lenXYZ()
-        for x in range(lenx):
-            for y in range(leny):
-                for z in range(lenz):
-                    yield self.index(x, y, z)
+        node = self.node
+        component_class = self.component_class
+        lenx, leny, lenz = node.lenXYZ()
+        for x, y, z in itertools.product(range(lenx), range(leny), range(lenz)):
+            yield component_class(node, self, x, y, z)
 
 
 class Component(nodes.Yam):
@@ -251,6 +284,17 @@ class Component(nodes.Yam):
     Base class for indexed component.
     """
 
+    __slots__ = (
+        "node",
+        "components",
+        "index",
+        "second_index",
+        "third_index",
+        "_types",
+        "_hash",
+        "_attribute",
+    )
+
     def __init__(self, node, components, index, secondIndex=None, thirdIndex=None):
         super().__init__()
         if isinstance(node, nodes.Transform):
@@ -261,6 +305,8 @@ class Component(nodes.Yam):
         self.second_index = secondIndex
         self.third_index = thirdIndex
         self._types = None
+        self._hash = None
+        self._attribute = None
 
     @property
     def isAYamComponent(self):
@@ -315,10 +361,13 @@ class Component(nodes.Yam):
         return hash(self) == hash(other)
 
     def __hash__(self):
-        return hash((self.node.hashCode, self.type(), self.indices()))
+        # The node and indices of a component never change, computing the hash only once
+        if self._hash is None:
+            self._hash = hash((self.node.hashCode, self.components.api_type, self.indices()))
+        return self._hash
 
     def exists(self):
-        return checks.objExists(self)
+        return checks.objExists(self.name)
 
     @property
     def name(self):
@@ -326,12 +375,15 @@ class Component(nodes.Yam):
 
     @property
     def attribute(self):
-        attribute = f"{self.components.component_name}[{self.index}]"
-        if self.second_index is not None:
-            attribute += f"[{self.second_index}]"
-        if self.third_index is not None:
-            attribute += f"[{self.third_index}]"
-        return attribute
+        # The indices of a component never change, building the attribute name only once
+        if self._attribute is None:
+            attribute = f"{self.components.component_name}[{self.index}]"
+            if self.second_index is not None:
+                attribute += f"[{self.second_index}]"
+            if self.third_index is not None:
+                attribute += f"[{self.third_index}]"
+            self._attribute = attribute
+        return self._attribute
 
     def indices(self):
         return self.index, self.second_index, self.third_index
@@ -352,14 +404,13 @@ class Component(nodes.Yam):
 
 
 class MeshVertex(Component):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def getPosition(self, ws=False):
-        if ws:
-            space = om.MSpace.kWorld
-        else:
-            space = om.MSpace.kObject
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
         p = self.node.MFn.getPoint(self.index, space)
         return [p.x, p.y, p.z]
 
@@ -370,23 +421,19 @@ class MeshVertex(Component):
             super().setPosition(values, ws)
 
     def setPositionOM(self, value, ws=False):
-        if ws:
-            space = om.MSpace.kWorld
-        else:
-            space = om.MSpace.kObject
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
         point = om.MPoint(value)
         self.node.MFn.setPoint(self.index, point, space)
 
 
 class CurveCV(Component):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def getPosition(self, ws=False):
-        if ws:
-            space = om.MSpace.kWorld
-        else:
-            space = om.MSpace.kObject
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
         p = self.node.MFn.cvPosition(self.index, space)
         return [p.x, p.y, p.z]
 
@@ -397,10 +444,7 @@ class CurveCV(Component):
             super().setPosition(value, ws)
 
     def setPositionOM(self, value, ws=False):
-        if ws:
-            space = om.MSpace.kWorld
-        else:
-            space = om.MSpace.kObject
+        space = om.MSpace.kWorld if ws else om.MSpace.kObject
         point = om.MPoint(*value)
         self.node.MFn.setCVPosition(self.index, point, space)
 
@@ -411,6 +455,8 @@ class ComponentsSlice(nodes.Yam):
     Warning : ComponentsSlice does contain the last index of the slice unlike in a Python slice.
     """
 
+    __slots__ = ("node", "components", "_slice", "_types")
+
     def __init__(self, node, components, components_slice):
         super().__init__()
         self.node = node
@@ -445,7 +491,12 @@ class ComponentsSlice(nodes.Yam):
 
     @property
     def indices(self):
-        return tuple(range(self.start, self.stop, self.step))
+        return tuple(self._range)
+
+    @property
+    def _range(self):
+        """The slice indices as a range, to avoid building the full tuple of indices when not needed."""
+        return range(self.start, self.stop, self.step)
 
     def __str__(self):
         if self.step != 1:
@@ -461,22 +512,22 @@ class ComponentsSlice(nodes.Yam):
     def __getitem__(self, item):
         if isinstance(item, slice):
             raise RuntimeError("cannot slice a ComponentsSlice object")
-        return self.components.index(self.indices[item])
+        return self.components.index(self._range[item])
 
     def __len__(self):
-        return len(self.indices)
+        return len(self._range)
 
     def __iter__(self):
-        for i in self.indices:
+        for i in self._range:
             yield self.components.index(i)
 
     def __eq__(self, other):
         if isinstance(other, ComponentsSlice):
-            return self.indices == other.indices
+            return self._range == other._range
         return False
 
     def __hash__(self):
-        return hash((self.node.hashCode, self.components.api_type, self.indices))
+        return hash((self.node.hashCode, self.components.api_type, self._range))
 
     @property
     def name(self):
@@ -503,9 +554,34 @@ class ComponentsSlice(nodes.Yam):
         return self.types()[-1]
 
     def getPositions(self, ws=False):
+        if isinstance(self.components, (MeshVertices, CurveCVs)):
+            # Getting all the points in a single api call and only converting the ones in the slice
+            space = om.MSpace.kWorld if ws else om.MSpace.kObject
+            MFn = self.node.MFn
+            if isinstance(self.components, MeshVertices):
+                points = MFn.getPoints(space)
+            else:
+                points = MFn.cvPositions(space)
+            getXYZ = mayautils.getXYZ
+            return [list(getXYZ(points[i])) for i in self._range]
         return [x.getPosition(ws=ws) for x in self]
 
+    @decorators.mayaundo
     def setPositions(self, values, ws=False):
+        if not config.undoable and isinstance(self.components, (MeshVertices, CurveCVs)):
+            # Replacing the sliced points in the full array of points and setting them back in a single api call
+            space = om.MSpace.kWorld if ws else om.MSpace.kObject
+            MFn = self.node.MFn
+            is_mesh = isinstance(self.components, MeshVertices)
+            points = MFn.getPoints(space) if is_mesh else MFn.cvPositions(space)
+            for i, value in zip(self._range, values):
+                points[i] = om.MPoint(value)
+            if is_mesh:
+                MFn.setPoints(points, space)
+            else:
+                MFn.setCVPositions(points, space)
+                MFn.updateCurve()
+            return
         for x, value in zip(self, values):
             x.setPosition(value, ws=ws)
 
@@ -522,27 +598,29 @@ class SupportedTypes:
     """
 
     # Removed 'v' because rarely used and similar to short name for 'visibility'
-    TYPES = {
-        "cv",
-        "e",
-        "ep",
-        "f",
-        "map",
-        "pt",
-        "sf",
-        "u",
-        "#v",
-        "vtx",
-        "vtxFace",
-        "cp",
-    }
+    TYPES = frozenset(
+        {
+            "cv",
+            "e",
+            "ep",
+            "f",
+            "map",
+            "pt",
+            "sf",
+            "u",
+            "#v",
+            "vtx",
+            "vtxFace",
+            "cp",
+        }
+    )
 
     MFNID_COMPONENT_CLASS = {
         om.MFn.kCurveCVComponent: ("cv", CurveCVs, CurveCV),  # 533
         om.MFn.kCurveEPComponent: ("ep", SingleIndexed, Component),  # 534
         om.MFn.kCurveParamComponent: ("u", SingleIndexed, Component),  # 536
         om.MFn.kIsoparmComponent: ("v", DoubleIndexed, Component),  # 537
-        om.MFn.kSurfaceCVComponent: ("cv", DoubleIndexed, Component),  # 539
+        om.MFn.kSurfaceCVComponent: ("cv", SurfaceCVs, Component),  # 539
         om.MFn.kLatticeComponent: ("pt", TripleIndexed, Component),  # 543
         om.MFn.kMeshEdgeComponent: ("e", SingleIndexed, Component),  # 548
         om.MFn.kMeshPolygonComponent: ("f", SingleIndexed, Component),  # 549
@@ -574,3 +652,11 @@ class SupportedTypes:
         nodes.NurbsSurface: "cv",
         nodes.Lattice: "pt",
     }
+
+
+# (component name, shape class) to (api type, components class), merging SupportedTypes.COMPONENT_SHAPE_MFNID and
+# SupportedTypes.MFNID_COMPONENT_CLASS for a single lookup in getComponent.
+_COMPONENT_TABLE = {
+    key: (api_type, SupportedTypes.MFNID_COMPONENT_CLASS[api_type][1])
+    for key, api_type in SupportedTypes.COMPONENT_SHAPE_MFNID.items()
+}
@@ -1,9 +1,14 @@
 # encoding: utf8
 
+import operator
+
 from maya import cmds, mel
 import maya.api.OpenMaya as om
 from . import nodes, xformutils, decorators, config, utils
 
+# Gets a (x, y, z) tuple from an MPoint, MVector or MFloatVector in a single C call.
+getXYZ = operator.attrgetter("x", "y", "z")
+
 
 def createHook(node, parent=None, suffix="hook"):
     """
@@ -72,6 +77,17 @@ def mxConstraint(source=None, target=None):
     cmds.delete(source_tmp.name, target_tmp.name)
 
 
+def _isSettable(MFn, attr):
+    """
+    Checks with the api if the given attribute is not locked and either not connected, or has only keyframed animation.
+    Same as Attribute.isSettable without having to get an Attribute object.
+    :param MFn: the node MFnDependencyNode
+    :param attr: str, the attribute name
+    :return: bool
+    """
+    return MFn.findPlug(attr, False).isFreeToChange() == om.MPlug.kFreeToChange
+
+
 def resetAttrs(objs=None, t=True, r=True, s=True, v=True, user=False, raiseErrors=True):
     """
     Resets the objs translate, rotate, scale, visibility and/or user defined attributes to their default values.
@@ -83,31 +99,39 @@ def resetAttrs(objs=None, t=True, r=True, s=True, v=True, user=False, raiseError
     :param user: if True resets the user attributes values to their respective default values.
     :param raiseErrors: If True, raises the encountered errors; skips them if False
     """
+    from . import attributes
+
     if not objs:
         objs = nodes.selected(type="transform")
         if not objs:
             raise RuntimeError("No object given or transform selected")
     objs = nodes.yams(objs)
 
-    tr = ""
-    if t:
-        tr += "t"
-    if r:
-        tr += "r"
+    compounds = [
+        (compound, default)
+        for compound, default, reset in (("t", 0, t), ("r", 0, r), ("s", 1, s))
+        if reset
+    ]
     for obj in objs:
-        for axe in "xyz":
-            for tr_ in tr:
-                attr = obj.attr(tr_ + axe)
-                if attr.isSettable():
-                    attr.value = 0
-            if s:
-                attr = obj.attr("s" + axe)
-                if attr.isSettable():
-                    attr.value = 1
-        if v:
-            attr = obj.v
-            if attr.isSettable():
-                attr.value = True
+        name = obj.name
+        MFn = obj.MFn
+        for compound, default in compounds:
+            channels = [compound + axe for axe in "xyz" if _isSettable(MFn, compound + axe)]
+            if not config.undoable:
+                # Setting the values with the api, same as Attribute.value does when not undoable
+                for channel in channels:
+                    attributes.setMPlugValue(MFn.findPlug(channel, False), default)
+            # All axes are settable, resetting them in one call on the compound
+            elif len(channels) == 3:
+                cmds.setAttr(f"{name}.{compound}", default, default, default)
+            else:
+                for channel in channels:
+                    cmds.setAttr(f"{name}.{channel}", default)
+        if v and _isSettable(MFn, "v"):
+            if not config.undoable:
+                attributes.setMPlugValue(MFn.findPlug("v", False), True)
+            else:
+                cmds.setAttr(f"{name}.v", True)
         if user:
             attrs = obj.listAttr(ud=True, scalar=True, visible=True)
             for attr in attrs:
@@ -383,11 +407,37 @@ def componentListToIndices(components):
     """
     indices = []
     for pack in components:
-        pack = pack.split("[")[-1][:-1]
-        if ":" in pack:
-            start, stop = pack.split(":")
-            start, stop = int(start), int(stop)
-            indices += list(range(start, stop + 1))
+        pack = pack[pack.rfind("[") + 1 : -1]
+        start, _, stop = pack.partition(":")
+        if stop:
+            indices.extend(range(int(start), int(stop) + 1))
         else:
-            indices.append(int(pack))
+            indices.append(int(start))
     return indices
+
+
+def indicesToComponentList(indices, component_type="vtx"):
+    """
+    Packs a list of component indices to a list of components, the inverse of componentListToIndices.
+    Consecutive indices are packed in a single range, e.g.: [0, 1, 2, 3, 5] -> ['vtx[0:3]', 'vtx[5]']
+    :param indices: list of int
+    :param component_type: str, the component type prefix, e.g.: 'vtx', 'cv'
+    :return: list of str
+    """
+    components = []
+    if not indices:
+        return components
+    indices = iter(indices)
+    start = stop = next(indices)
+    for index in indices:
+        if index == stop + 1:
+            stop = index
+            continue
+        components.append(
+            f"{component_type}[{start}:{stop}]" if stop != start else f"{component_type}[{start}]"
+        )
+        start = stop = index
+    components.append(
+        f"{component_type}[{start}:{stop}]" if stop != start else f"{component_type}[{start}]"
+    )
+    return components
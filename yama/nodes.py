@@ -299,9 +299,8 @@ class Singleton:
         else:  # finding if node type has a supported class
             type_id = MObject.apiType()
             # skips the SupportedTypes.getclass if exact type is in supported_class
-            if type_id in SupportedTypes.classes_MFn:
-                assigned_class = SupportedTypes.classes_MFn[type_id]
-            else:
+            assigned_class = SupportedTypes.classes_MFn.get(type_id)
+            if assigned_class is None:
                 assigned_class = cls.getclass_cmds(MObject)
             yam_node = assigned_class(MObject)
             cls._instances[hash_code] = yam_node
@@ -388,6 +387,8 @@ class Yam(abc.ABC):
     Should not be instantiated by itself.
     """
 
+    __slots__ = ()  # Lets subclasses defining __slots__ drop the per-instance __dict__
+
     @property
     @abc.abstractmethod
     def name(self):
@@ -1012,11 +1013,19 @@ class ControlPoint(Shape):
         return len(cmds.ls(self.name + ".cp[*]", fl=True))
 
     def getPositions(self, ws=False):
-        return [cp.getPosition(ws=ws) for cp in self.cp]
+        # Using the components bulk method, e.g.: a single MFnMesh.getPoints for mesh vertices
+        return self.cp.getPositions(ws=ws)
 
     def setPositions(self, data, ws=False):
-        for cp, pos in zip(self.cp, data):
-            cp.setPosition(pos, ws=ws)
+        cps = self.cp
+        data = list(data)
+        if len(data) != len(cps):
+            # Partial data, only setting the matching cps like zip would
+            for cp, pos in zip(cps, data):
+                cp.setPosition(pos, ws=ws)
+            return
+        # Using the components bulk method, e.g.: a single MFnMesh.setPoints for mesh vertices
+        cps.setPositions(data, ws=ws)
 
     def attr(self, attr):
         """
@@ -1256,9 +1265,10 @@ class WeightGeometryFilter(GeometryFilter):
         geometry = self.geometry
         if not geometry:
             raise RuntimeError(f"Deformer '{self}' is not connected to a geometry")
-        weightsAttr = self.weightsAttr
+        # Reading the elements MPlug directly instead of creating an Attribute object for each weight.
+        elementByLogicalIndex = self.weightsAttr.MPlug.elementByLogicalIndex
         return weightlist.WeightList(
-            (weightsAttr[x].value for x in range(len(geometry))),
+            [elementByLogicalIndex(i).asDouble() for i in range(len(geometry))],
             force_clamp=force_clamp,
             min_value=min_value,
             max_value=max_value,
@@ -1267,8 +1277,16 @@ class WeightGeometryFilter(GeometryFilter):
 
     def setWeights(self, weights):
         weightsAttr = self.weightsAttr
-        for i, weight in enumerate(weights):
-            weightsAttr[i].value = weight
+        if not config.undoable:
+            # Setting the elements MPlug directly instead of creating an Attribute object for each weight.
+            elementByLogicalIndex = weightsAttr.MPlug.elementByLogicalIndex
+            for i, weight in enumerate(weights):
+                elementByLogicalIndex(i).setDouble(weight)
+            return
+        # Setting all the weights in a single undoable call using a multi index range.
+        weights = list(weights)
+        if weights:
+            cmds.setAttr(f"{weightsAttr.name}[0:{len(weights) - 1}]", *weights)
 
     @property
     def weights(self):